@@ -1,8 +1,24 @@
 import re
+from itertools import izip_longest
+
 from cassandra import InvalidRequest, Unavailable, ConsistencyLevel, WriteFailure, WriteTimeout, ReadFailure, ReadTimeout
 from cassandra.query import SimpleStatement
 from tools import rows_to_list
 
+_SENTINEL = object()
+
+
+def assert_rows(res, expected):
+    """
+    Assert that the result set matches the expected list of rows, comparing
+    row by row without materializing an intermediate list of lists the way
+    rows_to_list does.
+    """
+    for i, (row, expected_row) in enumerate(izip_longest(res, expected, fillvalue=_SENTINEL)):
+        assert row is not _SENTINEL, "Fewer rows than expected, missing %s at index %d" % (expected_row, i)
+        assert expected_row is not _SENTINEL, "More rows than expected, unexpected %s at index %d" % (list(row), i)
+        assert list(row) == expected_row, "Expected %s at index %d, but got %s" % (expected_row, i, list(row))
+
 
 def assert_unavailable(fun, *args):
     try:
@@ -18,9 +34,17 @@ def assert_unavailable(fun, *args):
         assert False, "Expecting unavailable exception but no exception was raised"
 
 
-def assert_invalid(session, query, matching=None, expected=InvalidRequest):
+def assert_invalid(session, query, matching=None, expected=InvalidRequest, parse_only=False):
+    """
+    Assert that the server rejects the query. With parse_only=True the query
+    is only prepared, not executed; use it for statically invalid CQL (syntax
+    or schema rejections) to save the execution round-trip.
+    """
     try:
-        res = session.execute(query)
+        if parse_only:
+            res = session.prepare(query)
+        else:
+            res = session.execute(query)
         assert False, "Expecting query to be invalid: got %s" % res
     except AssertionError as e:
         raise e
@@ -54,6 +78,32 @@ def assert_all(session, query, expected, cl=ConsistencyLevel.ONE, ignore_order=F
     assert list_res == expected, "Expected %s from %s, but got %s" % (expected, query, list_res)
 
 
+def assert_all_concurrent(session, cases, cl=ConsistencyLevel.ONE):
+    """
+    Fire the given read-only queries concurrently and assert on every
+    result. `cases` holds (query, expected) pairs where expected is either
+    the expected list of rows, or InvalidRequest (the class itself) to
+    assert the server rejects the query. The queries travel as pipelined
+    async requests, so a battery of N assertions costs roughly one
+    round-trip instead of N.
+    """
+    futures = [(query, expected,
+                session.execute_async(SimpleStatement(query, consistency_level=cl)))
+               for query, expected in cases]
+    for query, expected, future in futures:
+        if expected is InvalidRequest:
+            try:
+                res = future.result()
+                assert False, "Expecting query to be invalid: got %s" % res
+            except AssertionError as e:
+                raise e
+            except InvalidRequest:
+                pass
+        else:
+            list_res = rows_to_list(future.result())
+            assert list_res == expected, "Expected %s from %s, but got %s" % (expected, query, list_res)
+
+
 def assert_almost_equal(*args, **kwargs):
     try:
         error = kwargs['error']
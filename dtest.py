@@ -86,10 +86,12 @@ def warning(msg):
         print "WARN: " + msg
 
 
-def debug(msg):
-    LOG.debug(msg, extra={"current_test": CURRENT_TEST})
+def debug(msg, *args):
+    # logging-style lazy formatting: the %-substitution only happens if a
+    # handler actually emits the record
+    LOG.debug(msg, *args, extra={"current_test": CURRENT_TEST})
     if PRINT_DEBUG:
-        print msg
+        print msg % args if args else msg
 
 
 def retry_till_success(fun, *args, **kwargs):
@@ -20,8 +20,10 @@ from dtest import CASSANDRA_DIR, DISABLE_VNODES, IGNORE_REQUIRE, debug
 
 
 def rows_to_list(rows):
-    new_list = [list(row) for row in rows]
-    return new_list
+    # map() already returns a list here and keeps the iteration in the
+    # interpreter's C layer, which is measurably faster than a
+    # Python-level loop for the large result sets some tests convert.
+    return map(list, rows)
 
 
 def create_c1c2_table(tester, session, read_repair=None):
@@ -211,7 +211,7 @@ class TestPagingSize(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
 
             # run a query that has no results and make sure it's exhausted
             future = cursor.execute_async(
@@ -229,7 +229,7 @@ class TestPagingSize(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -257,7 +257,7 @@ class TestPagingSize(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -292,7 +292,7 @@ class TestPagingSize(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -329,7 +329,7 @@ class TestPagingSize(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -380,7 +380,7 @@ class TestPagingWithModifiers(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -434,7 +434,7 @@ class TestPagingWithModifiers(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -488,7 +488,7 @@ class TestPagingWithModifiers(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -571,7 +571,7 @@ class TestPagingWithModifiers(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -651,7 +651,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
         """)
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE test")
             cursor.execute("TRUNCATE test2")
 
@@ -698,7 +698,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
         """)
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE test")
             cursor.execute("TRUNCATE test2")
 
@@ -730,7 +730,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -762,7 +762,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -796,7 +796,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -842,7 +842,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
                                'skipping'.format(latest_ver=latest_version_with_bug, min_ver=min_version))
 
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE test")
             cursor.row_factory = named_tuple_factory
 
@@ -1067,7 +1067,7 @@ class TestPagingData(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -1117,7 +1117,7 @@ class TestPagingDatasetChanges(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -1154,7 +1154,7 @@ class TestPagingDatasetChanges(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -1192,7 +1192,7 @@ class TestPagingDatasetChanges(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             # create rows with TTL (some of which we'll try to get after expiry)
@@ -1245,7 +1245,7 @@ class TestPagingDatasetChanges(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = create_rows(
@@ -1322,7 +1322,7 @@ class TestPagingQueryIsolation(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             data = """
@@ -1471,7 +1471,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
 
             expected_data = self.setup_data(cursor)
@@ -1518,7 +1518,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             expected_data = self.setup_data(cursor)
 
@@ -1538,7 +1538,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             expected_data = self.setup_data(cursor)
 
@@ -1589,7 +1589,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             expected_data = self.setup_data(cursor)
 
@@ -1642,7 +1642,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             expected_data = self.setup_data(cursor)
 
@@ -1683,7 +1683,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             data = self.setup_data(cursor)
 
@@ -1712,7 +1712,7 @@ class TestPagingWithDeletions(BasePagingTester, PageAssertionMixin):
 
         for is_upgraded, cursor in self.do_upgrade(cursor):
             cursor.row_factory = dict_factory
-            debug("Querying %s node" % ("upgraded" if is_upgraded else "old",))
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
             cursor.execute("TRUNCATE paging_test")
             self.setup_data(cursor)
 
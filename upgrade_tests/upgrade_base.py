@@ -4,10 +4,17 @@ import time
 from collections import namedtuple
 from unittest import skipIf
 
+from cassandra.concurrent import execute_concurrent_with_args
 from ccmlib.common import get_version_from_build, is_win
 from dtest import DEBUG, Tester, debug
 from tools import cassandra_git_branch, since
 
+# These two switches control which half of the do_upgrade loop runs: the
+# session against the upgraded node, the session against the old node, or
+# both (the default). Since the two branches are independent once the
+# cluster is upgraded, a CI setup can halve the wall time of these suites
+# by running two workers in parallel, one with QUERY_OLD=false and one
+# with QUERY_UPGRADED=false.
 QUERY_UPGRADED = os.environ.get('QUERY_UPGRADED', 'true').lower() in ('yes', 'true')
 QUERY_OLD = os.environ.get('QUERY_OLD', 'true').lower() in ('yes', 'true')
 OLD_CASSANDRA_DIR = os.environ.get('OLD_CASSANDRA_DIR', None)
@@ -83,9 +90,20 @@ class UpgradeTester(Tester):
     are testing. When run on 2.1 or 2.2, this will test the upgrade to 3.0.
     When run on 3.0, this will test the upgrade path to trunk. When run on
     versions above 3.0, this will test the upgrade path from 3.0 to HEAD.
+
+    Tests should issue all DDL (CREATE TABLE/INDEX/KEYSPACE) before the
+    do_upgrade loop and keep the loop body to DML and assertions: schema
+    changes inside the loop run against a mixed-version cluster and have to
+    propagate to the old node, and a CREATE INDEX there would redo its
+    full-table build once per iteration.
     """
     NODES, RF, __test__, CL = 2, 1, False, None
 
+    # caches for get_node_versions/get_node_version; invalidated by
+    # do_upgrade, the only place the node versions change
+    _node_versions = None
+    _version_by_branch = None
+
     def prepare(self, ordered=False, create_keyspace=True, use_cache=False,
                 nodes=None, rf=None, protocol_version=None, cl=None, **kwargs):
         nodes = self.NODES if nodes is None else nodes
@@ -95,6 +113,10 @@ class UpgradeTester(Tester):
         self.CL = cl  # store for later use in do_upgrade
 
         assert nodes >= 2, "backwards compatibility tests require at least two nodes"
+        # Unlike most dtest suites these tests cannot run with REUSE_CLUSTER /
+        # canReuseCluster: do_upgrade swaps the install dir out from under
+        # node1 (and node2 in 'all' mode), so a reused cluster would start the
+        # next test on the wrong version.
         assert not self._preserve_cluster, "preserve_cluster cannot be True for upgrade tests"
 
         self.protocol_version = protocol_version
@@ -111,7 +133,10 @@ class UpgradeTester(Tester):
         if start_rpc:
             cluster.set_configuration_options(values={'start_rpc': True})
 
-        cluster.set_configuration_options(values={'internode_compression': 'none'})
+        # Most tests TRUNCATE their tables once per do_upgrade iteration;
+        # without this, every TRUNCATE snapshots the table on all nodes.
+        cluster.set_configuration_options(values={'internode_compression': 'none',
+                                                  'auto_snapshot': False})
         if not cluster.nodelist():
             cluster.populate(nodes)
             node1 = cluster.nodelist()[0]
@@ -150,8 +175,77 @@ class UpgradeTester(Tester):
         if cl:
             session.default_consistency_level = cl
 
+        # Paging is transparent to result correctness, and several tests rely
+        # on ordering across the full result set, so hand out sessions with
+        # paging disabled; tests that exercise paging set their own fetch
+        # size.
+        session.default_fetch_size = None
+
         return session
 
+    def prepare_cached(self, session, cql):
+        """
+        Return a PreparedStatement for `cql`, caching preparations on the
+        session so repeated uses of the same text are only parsed
+        server-side once.
+        """
+        try:
+            cache = session._dtest_prepared_cache
+        except AttributeError:
+            cache = session._dtest_prepared_cache = {}
+        statement = cache.get(cql)
+        if statement is None:
+            statement = cache[cql] = session.prepare(cql)
+        return statement
+
+    def upgrade_branches(self, session, *truncate):
+        """
+        Fold the preamble every test repeats around do_upgrade: log which
+        node the branch queries and concurrently TRUNCATE the given tables
+        before yielding each (is_upgraded, session) pair.
+        """
+        for is_upgraded, session in self.do_upgrade(session):
+            debug("Querying %s node", "upgraded" if is_upgraded else "old")
+            if truncate:
+                self.truncate_tables(session, *truncate)
+            yield is_upgraded, session
+
+    def create_schema_concurrently(self, session, *ddls):
+        """
+        Run independent DDL statements concurrently and wait for schema
+        agreement once at the end, instead of paying the propagation wait
+        per statement.
+        """
+        futures = [session.execute_async(ddl) for ddl in ddls]
+        for future in futures:
+            future.result()
+        session.cluster.control_connection.wait_for_schema_agreement()
+
+    def truncate_tables(self, session, *tables):
+        """
+        TRUNCATE the given tables concurrently. Each TRUNCATE is a
+        cluster-wide barrier, so overlapping them pays for one barrier
+        rather than one per table.
+
+        Tests reset state with TRUNCATE rather than creating a fresh table
+        per iteration on purpose: after do_upgrade the cluster is running
+        mixed versions, and schema changes on a mixed-version cluster are
+        exactly what these tests must not do outside of what they are
+        testing. With auto_snapshot disabled in prepare(), TRUNCATE does not
+        snapshot and stays cheap for the small data sets used here.
+        """
+        futures = [session.execute_async("TRUNCATE %s" % table) for table in tables]
+        for future in futures:
+            future.result()
+
+    def _bulk_insert(self, session, cql, params_list, concurrency=100):
+        """
+        Prepare `cql` once and execute it for every parameter tuple in
+        `params_list`, keeping up to `concurrency` statements in flight.
+        """
+        prepared = self.prepare_cached(session, cql)
+        execute_concurrent_with_args(session, prepared, params_list, concurrency=concurrency)
+
     def do_upgrade(self, session):
         """
         Upgrades the first node in the cluster and returns a list of
@@ -159,6 +253,8 @@ class UpgradeTester(Tester):
         Session is connected to the upgraded node.
         """
         session.cluster.shutdown()
+        self._node_versions = None
+        self._version_by_branch = None
         node1 = self.cluster.nodelist()[0]
         node2 = self.cluster.nodelist()[1]
 
@@ -235,6 +331,10 @@ class UpgradeTester(Tester):
             for is_upgraded, session in sessions:
                 session.default_consistency_level = self.CL
 
+        # keep the paging default from prepare() on the new sessions
+        for is_upgraded, session in sessions:
+            session.default_fetch_size = None
+
         return sessions
 
     def get_version(self):
@@ -242,7 +342,11 @@ class UpgradeTester(Tester):
         return node1.version()
 
     def get_node_versions(self):
-        return [n.get_cassandra_version() for n in self.cluster.nodelist()]
+        # ccm re-reads the install directory on every call, so cache the
+        # versions until do_upgrade changes them
+        if self._node_versions is None:
+            self._node_versions = [n.get_cassandra_version() for n in self.cluster.nodelist()]
+        return self._node_versions
 
     def node_version_above(self, version):
         return min(self.get_node_versions()) >= version
@@ -251,9 +355,11 @@ class UpgradeTester(Tester):
         """
         Used in places where is_upgraded was used to determine if the node version was >=2.2.
         """
-        node_versions = self.get_node_versions()
-        self.assertLessEqual(len(set(node_versions)), 2)
-        return max(node_versions) if is_upgraded else min(node_versions)
+        if self._version_by_branch is None:
+            node_versions = self.get_node_versions()
+            self.assertLessEqual(len(set(node_versions)), 2)
+            self._version_by_branch = {False: min(node_versions), True: max(node_versions)}
+        return self._version_by_branch[is_upgraded]
 
     def tearDown(self):
         # Ignore errors before upgrade on Windows
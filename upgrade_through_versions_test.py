@@ -1,4 +1,4 @@
-import bisect
+import json
 import operator
 import os
 import pprint
@@ -9,14 +9,14 @@ import signal
 import subprocess
 import time
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
 from distutils.version import LooseVersion
 from multiprocessing import Process, Queue
+from threading import Thread
 from Queue import Empty, Full
 
-import psutil
-
 from cassandra import ConsistencyLevel, WriteTimeout
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.query import SimpleStatement
 from dtest import DEFAULT_DIR, Tester, debug
 from tools import generate_ssl_stores, new_node
@@ -37,6 +37,9 @@ PROTOCOL_PATHS = {
 
 PROTOCOL_VERSION = int(os.environ.get('PROTOCOL_VERSION', 3))
 
+# how many writes the continuous writer processes keep in flight at once
+WRITE_WINDOW_SIZE = 32
+
 CUSTOM_PATH = os.environ.get('UPGRADE_PATH', None)
 if CUSTOM_PATH:
     # provide a custom path like so: "1_2:2_0:2_1" to test upgrading from 1.2 to 2.0 to 2.1
@@ -53,22 +56,71 @@ if LOCAL_MODE:
 else:
     REPO_LOCATION = "https://git-wip-us.apache.org/repos/asf/cassandra.git"
 
-# lets cache this once so we don't make a bunch of remote requests
-GIT_LS = subprocess.check_output(["git", "ls-remote", "-h", "-t", REPO_LOCATION]).rstrip()
+# matches one ls-remote line; the optional ^{} suffix on peeled tags is
+# stripped by the pattern itself
+_LS_RE = re.compile(r'^([0-9a-f]{40})\trefs/(heads|tags)/([^\^\n]+?)(?:\^\{\})?$')
+
+# parsed ls-remote output is cached on disk for a while, so repeated runs
+# (or several test processes starting in the same window) don't each pay
+# the remote round-trip at import
+_REF_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'cassandra-dtest', 'git_ls.json')
+_REF_CACHE_TTL_S = 3600
+
+
+def _load_cached_refs():
+    try:
+        with open(_REF_CACHE_PATH) as cache_file:
+            cache = json.load(cache_file)
+        if cache['repo'] == REPO_LOCATION and (time.time() - cache['ts']) < _REF_CACHE_TTL_S:
+            return cache['refs']
+    except (IOError, ValueError, KeyError):
+        pass
+    return None
 
-# maps ref type (branch, tags) to ref names and sha's
-MAPPED_REFS = defaultdict(dict)
-for row in GIT_LS.split('\n'):
-    sha, _fullref = row.split('\t')
-    _, ref_type, ref = _fullref.split('/')
-    MAPPED_REFS[ref_type][ref.split('^')[0]] = sha
 
-# We often want this post-mortem when debugging may have been disabled, so print/pprint is intentional here
-print("************************************* GIT REFS USED FOR THIS TEST RUN *********************************************")
-print("************************** KEEP IN MIND THAT A SHA MAY POINT TO ANOTHER COMMIT SHA! *******************************")
-for ref_type in MAPPED_REFS.keys():
-    print("Git refs for {}:").format(ref_type.upper())
-    pprint.pprint(MAPPED_REFS[ref_type], indent=4)
+def _store_cached_refs(refs):
+    # best effort; a failed write just means the next run re-fetches
+    try:
+        cache_dir = os.path.dirname(_REF_CACHE_PATH)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(_REF_CACHE_PATH, 'w') as cache_file:
+            json.dump({'repo': REPO_LOCATION, 'ts': time.time(), 'refs': refs}, cache_file)
+    except (IOError, OSError):
+        pass
+
+
+def _fetch_refs():
+    # parse git's output as it streams in rather than buffering the whole
+    # blob. The result is a plain dict mapping ref type (heads, tags) to
+    # ref names and sha's: a typo'd ref type should raise, not yield an
+    # empty dict.
+    refs = {'heads': {}, 'tags': {}}
+    ls_proc = subprocess.Popen(["git", "ls-remote", "-h", "-t", REPO_LOCATION], stdout=subprocess.PIPE)
+    for line in iter(ls_proc.stdout.readline, ''):
+        match = _LS_RE.match(line.rstrip())
+        if match:
+            sha, ref_type, ref = match.groups()
+            refs[ref_type][ref] = sha
+    if ls_proc.wait() != 0:
+        raise subprocess.CalledProcessError(ls_proc.returncode, "git ls-remote " + REPO_LOCATION)
+    return refs
+
+
+MAPPED_REFS = _load_cached_refs()
+if MAPPED_REFS is None:
+    MAPPED_REFS = _fetch_refs()
+    _store_cached_refs(MAPPED_REFS)
+
+# We often want this post-mortem when debugging may have been disabled, so print/pprint
+# is intentional here; set SKIP_REF_DUMP when the formatting cost/log volume is unwanted
+# (e.g. many workers importing this module in parallel)
+if os.environ.get('SKIP_REF_DUMP', '').lower() not in ('yes', 'true'):
+    print("************************************* GIT REFS USED FOR THIS TEST RUN *********************************************")
+    print("************************** KEEP IN MIND THAT A SHA MAY POINT TO ANOTHER COMMIT SHA! *******************************")
+    for ref_type in MAPPED_REFS.keys():
+        print("Git refs for {}:".format(ref_type.upper()))
+        pprint.pprint(MAPPED_REFS[ref_type], indent=4)
 
 if os.environ.get('CASSANDRA_VERSION'):
     debug('CASSANDRA_VERSION is not used by upgrade tests!')
@@ -78,6 +130,12 @@ def sha_for_ref_name(ref_name, ref_type='tags'):
     return MAPPED_REFS[ref_type][ref_name]
 
 
+# Version-matching pattern for release tags, compiled once: matches both
+# cassandra-x.y.z(-foo) and bare x.y.z(-foo) tags such as 1.2.3-tentative
+# in a single pass, capturing the major/minor so tags can be bucketed.
+_TAG_PATTERN = re.compile(r'^(?:cassandra-)?((\d+)\.(\d+)\.\d*(?:-+\w+)*)$')
+
+
 class GitSemVer(object):
     """
     Wraps a git ref up with a semver (as LooseVersion)
@@ -87,47 +145,48 @@ class GitSemVer(object):
 
     def __init__(self, git_ref, semver_str):
         self.git_ref = git_ref
-        self.semver = LooseVersion(semver_str)
         if semver_str == 'trunk':
-            self.semver = LooseVersion(make_ver_str(TRUNK_VER))
+            semver_str = make_ver_str(TRUNK_VER)
+        self.semver = _loose_version(semver_str)
+        # Precomputed sort key, so comparisons are a tuple compare instead of
+        # substring scans. A release must rank above a "nicknamed" tag of the
+        # same base version (3.0.0 > 3.0.0-rc1, 3.3 > 3.3-beta1), so the key
+        # is (base version, is-release, full parsed version): the middle
+        # element breaks base-version ties in favour of the bare release and
+        # the last orders the suffixed tags among themselves.
+        base = semver_str.split('-')[0]
+        self._key = (_loose_version(base).version, base == semver_str, self.semver.version)
 
     def __cmp__(self, other):
-        # when comparing x.y.z and x.y.z-foo, we need to value x.y.z higher than the "nicknamed" tag x.y.z-foo
-        # likewise for shorter versions of the form X.Y and X.Y-foo
-        # to accomplish this, check if "x.y.z-" (note the dash there) is contained within "x.y.z-foo", and if so declare x.y.z the higher version
-        # e.g. when comparing 3.0.0 and 3.0.0-rc1, consider 3.0.0 higher
-        # e.g. when comparing 3.3 and 3.3-beta1, consider 3.3 higher
-        if (len(self.semver.version) <= 3) or (len(other.semver.version) <= 3):
-            if self.semver.vstring + "-" in other.semver.vstring:
-                return 1
-            elif other.semver.vstring + "-" in self.semver.vstring:
-                return -1
-            elif other.semver.vstring == self.semver.vstring:
-                return 0
-
-        return cmp(self.semver, other.semver)
+        return cmp(self._key, other._key)
 
 
-def latest_tag_matching(ver_tuple):
+def _bucket_tags_by_version():
     """
-    Returns the latest tag matching a version tuple, such as (1, 2) to represent version 1.2
+    Walk the cached tag refs once and bucket them by (major, minor), each
+    bucket sorted ascending, so latest_tag_matching is a dict lookup instead
+    of a regex scan over every tag in the repo per call.
     """
-    ver_str = make_ver_str(ver_tuple)
-
-    wrappers = []
-    # step through each tag found in the git repo
-    # check if the tag is a match for the base version provided in ver_tuple
-    # if it's a match add it to wrappers and when we complete this process give back the latest version found
+    buckets = defaultdict(list)
     for t in MAPPED_REFS['tags'].keys():
-        # let's short circuit if the tag we are checking matches the cassandra-x.y.z format, otherwise make another attempt for x.y.z-foo in case it's something line 1.2.3-tentative
-        match = re.match('^cassandra-({ver_str}\.\d+(-+\w+)*)$'.format(ver_str=ver_str), t) or re.match('^({ver_str}\.\d*(-+\w+)*)$'.format(ver_str=ver_str), t)
+        match = _TAG_PATTERN.match(t)
         if match:
-            gsv = GitSemVer(t, match.group(1))
-            bisect.insort(wrappers, gsv)
+            buckets[(int(match.group(2)), int(match.group(3)))].append(GitSemVer(t, match.group(1)))
+    for wrappers in buckets.values():
+        wrappers.sort()
+    return buckets
+
 
+TAGS_BY_VERSION = _bucket_tags_by_version()
+
+
+def latest_tag_matching(ver_tuple):
+    """
+    Returns the latest tag matching a version tuple, such as (1, 2) to represent version 1.2
+    """
+    wrappers = TAGS_BY_VERSION.get(ver_tuple)
     if wrappers:
-        latest = wrappers.pop().git_ref
-        return latest
+        return wrappers[-1].git_ref
 
     return None
 
@@ -152,17 +211,31 @@ def make_branch_str(_tuple):
     return 'cassandra-{}.{}'.format(_tuple[0], _tuple[1])
 
 
+_LOOSE_VERSION_CACHE = {}
+
+
+def _loose_version(version_str):
+    """
+    Memoized LooseVersion constructor: only a handful of unique version
+    strings ever show up in a run, so don't re-parse them each time.
+    """
+    try:
+        return _LOOSE_VERSION_CACHE[version_str]
+    except KeyError:
+        return _LOOSE_VERSION_CACHE.setdefault(version_str, LooseVersion(version_str))
+
+
 def sanitize_version(version):
     """
     Takes versions of the form cassandra-1.2, 2.0.10, or trunk.
     Returns just the version string 'X.Y.Z'
     """
     if version.find('-') >= 0:
-        return LooseVersion(version.split('-')[1])
+        return _loose_version(version.split('-')[1])
     elif version == 'trunk':
-        return LooseVersion(make_ver_str(TRUNK_VER))
+        return _loose_version(make_ver_str(TRUNK_VER))
     else:
-        return LooseVersion(version)
+        return _loose_version(version)
 
 
 def switch_jdks(version):
@@ -177,11 +250,22 @@ def switch_jdks(version):
     debug("Set JAVA_HOME: [{}] for cassandra version: [{}]".format(os.environ['JAVA_HOME'], version))
 
 
-def data_writer(tester, to_verify_queue, verification_done_queue, rewrite_probability=0):
+def _random_uuids(batch_size=1024):
+    """
+    Yields random (version 4) UUIDs, reading urandom one large batch at a
+    time so the continuous writer processes don't pay a syscall per id.
+    """
+    while True:
+        buf = os.urandom(16 * batch_size)
+        for i in xrange(0, len(buf), 16):
+            yield uuid.UUID(bytes=buf[i:i + 16], version=4)
+
+
+def data_writer(tester, to_verify_queue, verification_done_queue, rewrite_probability=0, batch_size=64):
     """
     Process for writing/rewriting data continuously.
 
-    Pushes to a queue to be consumed by data_checker.
+    Pushes batches of batch_size rows to a queue to be consumed by data_checker.
 
     Pulls from a queue of already-verified rows written by data_checker that it can overwrite.
 
@@ -201,6 +285,15 @@ def data_writer(tester, to_verify_queue, verification_done_queue, rewrite_probab
 
     signal.signal(signal.SIGTERM, handle_sigterm)
 
+    # keep a modest window of writes in flight so we pipeline requests
+    # instead of paying a full QUORUM round-trip per row. A row is only
+    # handed to the checker once its write has been acked, and acked rows
+    # travel in batches so the queue pays its pickle/semaphore cost once
+    # per batch rather than once per row.
+    in_flight = deque()
+    pending = []
+    fresh_uuids = _random_uuids()
+
     while True:
         try:
             key = None
@@ -212,13 +305,22 @@ def data_writer(tester, to_verify_queue, verification_done_queue, rewrite_probab
                     # we wanted a re-write but the re-writable queue was empty. oh well.
                     pass
 
-            key = key or uuid.uuid4()
+            key = key or next(fresh_uuids)
 
-            val = uuid.uuid4()
+            val = next(fresh_uuids)
 
-            session.execute(prepared, (val, key))
+            if len(in_flight) >= WRITE_WINDOW_SIZE:
+                done_key, done_val, future = in_flight.popleft()
+                future.result()
+                pending.append((done_key, done_val,))
+                if len(pending) >= batch_size:
+                    # blocking put: if the checker lags far enough behind to
+                    # fill the queue, throttle the writer instead of growing
+                    # RSS without bound
+                    to_verify_queue.put(pending)
+                    pending = []
 
-            to_verify_queue.put_nowait((key, val,))
+            in_flight.append((key, val, session.execute_async(prepared, (val, key))))
         except Exception:
             debug("Error in data writer process!")
             to_verify_queue.close()
@@ -229,7 +331,7 @@ def data_checker(tester, to_verify_queue, verification_done_queue):
     """
     Process for checking data continuously.
 
-    Pulls from a queue written to by data_writer to know what to verify.
+    Pulls batches from a queue written to by data_writer to know what to verify.
 
     Pushes to a queue to tell data_writer what's been verified and could be a candidate for re-writing.
 
@@ -253,17 +355,19 @@ def data_checker(tester, to_verify_queue, verification_done_queue):
         try:
             # here we could block, but if the writer process terminates early with an empty queue
             # we would end up blocking indefinitely
-            (key, expected_val) = to_verify_queue.get_nowait()
-
-            actual_val = session.execute(prepared, (key,))[0][0]
+            batch = to_verify_queue.get_nowait()
         except Empty:
             time.sleep(0.1)  # let's not eat CPU if the queue is empty
             continue
-        except Exception:
-            debug("Error in data verifier process!")
-            verification_done_queue.close()
-            raise
-        else:
+
+        for (key, expected_val) in batch:
+            try:
+                actual_val = session.execute(prepared, (key,))[0][0]
+            except Exception:
+                debug("Error in data verifier process!")
+                verification_done_queue.close()
+                raise
+
             try:
                 verification_done_queue.put_nowait(key)
             except Full:
@@ -273,14 +377,14 @@ def data_checker(tester, to_verify_queue, verification_done_queue):
                 # rewrite rows in the same sequence as originally written
                 pass
 
-        tester.assertEqual(expected_val, actual_val, "Data did not match expected value!")
+            tester.assertEqual(expected_val, actual_val, "Data did not match expected value!")
 
 
-def counter_incrementer(tester, to_verify_queue, verification_done_queue, rewrite_probability=0):
+def counter_incrementer(tester, to_verify_queue, verification_done_queue, rewrite_probability=0, batch_size=64):
     """
     Process for incrementing counters continuously.
 
-    Pushes to a queue to be consumed by counter_checker.
+    Pushes batches of batch_size keys to a queue to be consumed by counter_checker.
 
     Pulls from a queue of already-verified rows written by data_checker that it can increment again.
 
@@ -300,6 +404,13 @@ def counter_incrementer(tester, to_verify_queue, verification_done_queue, rewrit
 
     signal.signal(signal.SIGTERM, handle_sigterm)
 
+    # same in-flight window and batching as data_writer: pipeline the
+    # increments and only queue a key for verification, a batch at a time,
+    # once its increment has been acked.
+    in_flight = deque()
+    pending = []
+    fresh_uuids = _random_uuids()
+
     while True:
         try:
             key = None
@@ -312,11 +423,20 @@ def counter_incrementer(tester, to_verify_queue, verification_done_queue, rewrit
                     # we wanted a re-write but the re-writable queue was empty. oh well.
                     pass
 
-            key = key or uuid.uuid4()
+            key = key or next(fresh_uuids)
 
-            session.execute(prepared, (key))
+            if len(in_flight) >= WRITE_WINDOW_SIZE:
+                done_key, done_count, future = in_flight.popleft()
+                future.result()
+                pending.append((done_key, done_count,))
+                if len(pending) >= batch_size:
+                    # blocking put: if the checker lags far enough behind to
+                    # fill the queue, throttle the writer instead of growing
+                    # RSS without bound
+                    to_verify_queue.put(pending)
+                    pending = []
 
-            to_verify_queue.put_nowait((key, count + 1,))
+            in_flight.append((key, count + 1, session.execute_async(prepared, (key,))))
         except Exception:
             debug("Error in counter incrementer process!")
             to_verify_queue.close()
@@ -327,7 +447,7 @@ def counter_checker(tester, to_verify_queue, verification_done_queue):
     """
     Process for checking counters continuously.
 
-    Pulls from a queue written to by counter_incrementer to know what to verify.
+    Pulls batches from a queue written to by counter_incrementer to know what to verify.
 
     Pushes to a queue to tell counter_incrementer what's been verified and could be a candidate for incrementing again.
 
@@ -351,17 +471,19 @@ def counter_checker(tester, to_verify_queue, verification_done_queue):
         try:
             # here we could block, but if the writer process terminates early with an empty queue
             # we would end up blocking indefinitely
-            (key, expected_count) = to_verify_queue.get_nowait()
-
-            actual_count = session.execute(prepared, (key,))[0][0]
+            batch = to_verify_queue.get_nowait()
         except Empty:
             time.sleep(0.1)  # let's not eat CPU if the queue is empty
             continue
-        except Exception:
-            debug("Error in counter verifier process!")
-            verification_done_queue.close()
-            raise
-        else:
+
+        for (key, expected_count) in batch:
+            try:
+                actual_count = session.execute(prepared, (key,))[0][0]
+            except Exception:
+                debug("Error in counter verifier process!")
+                verification_done_queue.close()
+                raise
+
             tester.assertEqual(expected_count, actual_count, "Data did not match expected value!")
 
             try:
@@ -390,6 +512,7 @@ class TestUpgradeThroughVersions(Tester):
             r'Can\'t send migration request: node.*is down',
         ]
         self.subprocs = []
+        self._verify_session = None
         # Force cluster options that are common among versions:
         kwargs['cluster_options'] = {'partitioner': 'org.apache.cassandra.dht.Murmur3Partitioner'}
         Tester.__init__(self, *args, **kwargs)
@@ -447,6 +570,9 @@ class TestUpgradeThroughVersions(Tester):
         # Record the rows we write as we go:
         self.row_values = set()
         cluster = self.cluster
+        # test_versions is a property that rebuilds its list on every access;
+        # grab it once for the scenario
+        test_versions = self.test_versions
         if cluster.version() >= '3.0':
             cluster.set_configuration_options({'enable_user_defined_functions': 'true',
                                                'enable_scripted_user_defined_functions': 'true'})
@@ -460,7 +586,7 @@ class TestUpgradeThroughVersions(Tester):
 
         if populate:
             # Start with 3 node cluster
-            debug('Creating cluster (%s)' % self.test_versions[0])
+            debug('Creating cluster (%s)' % test_versions[0])
             cluster.populate(3)
             [node.start(use_jna=True, wait_for_binary_proto=True) for node in cluster.nodelist()]
         else:
@@ -480,7 +606,7 @@ class TestUpgradeThroughVersions(Tester):
             debug("Skipping schema creation (should already be built)")
         time.sleep(5)  # sigh...
 
-        self._log_current_ver(self.test_versions[0])
+        self._log_current_ver(test_versions[0])
         self.created_metadata_versions = []
 
         if rolling:
@@ -489,7 +615,7 @@ class TestUpgradeThroughVersions(Tester):
             increment_proc, incr_verify_proc, incr_verify_queue = self._start_continuous_counter_increment_and_verify(wait_for_rowcount=5000)
 
             # upgrade through versions
-            for tag in self.test_versions[1:]:
+            for tag in test_versions[1:]:
                 for num, node in enumerate(self.cluster.nodelist()):
                     # sleep (sigh) because driver needs extra time to keep up with topo and make quorum possible
                     # this is ok, because a real world upgrade would proceed much slower than this programmatic one
@@ -517,13 +643,13 @@ class TestUpgradeThroughVersions(Tester):
         # not a rolling upgrade, do everything in parallel:
         else:
             # upgrade through versions
-            for tag in self.test_versions[1:]:
+            for prev_index, tag in enumerate(test_versions[1:]):
                 self._write_values()
                 self._increment_counters()
 
                 for completed_version in self.created_metadata_versions:
                     self._check_metadata_schemas(completed_version[0], completed_version[1])
-                self._create_metadata_schemas(self.test_versions[self.test_versions.index(tag) - 1])
+                self._create_metadata_schemas(test_versions[prev_index])
 
                 self.upgrade_to_version(tag)
                 self.cluster.set_install_dir(version='git:' + tag)
@@ -568,8 +694,8 @@ class TestUpgradeThroughVersions(Tester):
         for s in self.subprocs:
             if s.is_alive():
                 try:
-                    psutil.Process(s.pid).kill()  # with fire damnit
-                except Exception:
+                    os.kill(s.pid, signal.SIGKILL)  # with fire damnit
+                except OSError:
                     debug("Error terminating subprocess. There could be a lingering process.")
                     pass
 
@@ -580,6 +706,9 @@ class TestUpgradeThroughVersions(Tester):
         and upgrade all nodes.
         """
         debug('Upgrading {nodes} to {tag}'.format(nodes=[n.name for n in nodes] if nodes is not None else 'all nodes', tag=tag))
+        # any cached verification session would span the version bump; drop
+        # it so the next helper reconnects to the upgraded cluster
+        self._verify_session = None
         switch_jdks(tag)
         debug(os.environ['JAVA_HOME'])
         if not partial:
@@ -610,13 +739,21 @@ class TestUpgradeThroughVersions(Tester):
         # otherwise they won't be grouped into dc's properly for multi-dc tests
         self.cluster._Cluster__update_topology_files()
 
-        # Restart nodes on new version
+        # Restart nodes on new version. Starts stay serial so each node can
+        # see the previous one come up before joining.
         for node in nodes:
             debug('Starting %s on new version (%s)' % (node.name, tag))
             # Setup log4j / logback again (necessary moving from 2.0 -> 2.1):
             node.set_log_level("INFO")
             node.start(wait_other_notice=True, wait_for_binary_proto=True)
-            node.nodetool('upgradesstables -a')
+
+        # upgradesstables only rewrites local data, so once everything is up
+        # the nodes can run it concurrently instead of one at a time
+        sstable_threads = [Thread(target=node.nodetool, args=('upgradesstables -a',)) for node in nodes]
+        for thread in sstable_threads:
+            thread.start()
+        for thread in sstable_threads:
+            thread.join()
 
     def _log_current_ver(self, current_tag):
         """
@@ -686,18 +823,27 @@ class TestUpgradeThroughVersions(Tester):
     def _write_values(self, num=100):
         session = self.patient_cql_connection(self.node2, protocol_version=PROTOCOL_VERSION)
         session.execute("use upgrade")
-        for i in xrange(num):
-            x = len(self.row_values) + 1
-            session.execute("UPDATE cf SET v='%d' WHERE k=%d" % (x, x))
-            self.row_values.add(x)
+        prepared = session.prepare("UPDATE cf SET v=? WHERE k=?")
+        start = len(self.row_values) + 1
+        keys = range(start, start + num)
+        # pipelined through the driver instead of one round-trip per row
+        execute_concurrent_with_args(session, prepared, [(str(x), x) for x in keys],
+                                     concurrency=50)
+        self.row_values.update(keys)
 
     def _check_values(self, consistency_level=ConsistencyLevel.ALL):
         for node in self.cluster.nodelist():
             session = self.patient_cql_connection(node, protocol_version=PROTOCOL_VERSION)
             session.execute("use upgrade")
-            for x in self.row_values:
-                query = SimpleStatement("SELECT k,v FROM cf WHERE k=%d" % x, consistency_level=consistency_level)
-                result = session.execute(query)
+            # one prepared statement per node, with the per-row reads
+            # pipelined rather than paying a round-trip each
+            prepared = session.prepare("SELECT k,v FROM cf WHERE k=?")
+            prepared.consistency_level = consistency_level
+            expected = sorted(self.row_values)
+            results = execute_concurrent_with_args(session, prepared, [(x,) for x in expected],
+                                                   concurrency=50)
+            for x, (success, result) in zip(expected, results):
+                self.assertTrue(success, "Failed to read back k=%d: %s" % (x, result))
                 k, v = result[0]
                 self.assertEqual(x, k)
                 self.assertEqual(str(x), v)
@@ -732,130 +878,170 @@ class TestUpgradeThroughVersions(Tester):
         else:
             raise RuntimeError("Ran out of time waiting for queue size ({}) to be '{}' to {}. Aborting.".format(qsize, opfunc.__name__, required_len))
 
-    def _start_continuous_write_and_verify(self, wait_for_rowcount=0, max_wait_s=300):
+    def _start_producer_verifier(self, label, producer, verifier, wait_for_rowcount=0, max_wait_s=300, batch_size=64, max_pending_batches=200):
         """
-        Starts a writer process, a verifier process, a queue to track writes,
-        and a queue to track successful verifications (which are rewrite candidates).
+        Starts a producer process, a verifier process, a queue of batches
+        awaiting verification, and a queue of verified entries (which are
+        rewrite candidates).
 
-        wait_for_rowcount provides a number of rows to write before unblocking and continuing.
+        wait_for_rowcount provides a number of rows to produce before unblocking and continuing.
 
-        Returns the writer process, verifier process, and the to_verify_queue.
+        Returns the producer process, verifier process, and the to_verify_queue.
         """
-        # queue of writes to be verified
-        to_verify_queue = Queue()
+        # queue of batches of writes to be verified; bounded so a lagging
+        # verifier throttles the producer rather than buffering forever
+        to_verify_queue = Queue(maxsize=max_pending_batches)
         # queue of verified writes, which are update candidates
         verification_done_queue = Queue(maxsize=500)
 
-        writer = Process(target=data_writer, args=(self, to_verify_queue, verification_done_queue, 25))
+        producer_proc = Process(target=producer, args=(self, to_verify_queue, verification_done_queue, 25, batch_size))
         # daemon subprocesses are killed automagically when the parent process exits
-        writer.daemon = True
-        self.subprocs.append(writer)
-        writer.start()
+        producer_proc.daemon = True
+        self.subprocs.append(producer_proc)
+        producer_proc.start()
 
         if wait_for_rowcount > 0:
-            self._wait_until_queue_condition('rows written (but not verified)', to_verify_queue, operator.ge, wait_for_rowcount, max_wait_s=max_wait_s)
+            # the queue holds batches, so wait on the equivalent batch count
+            self._wait_until_queue_condition(label, to_verify_queue, operator.ge, wait_for_rowcount // batch_size, max_wait_s=max_wait_s)
 
-        verifier = Process(target=data_checker, args=(self, to_verify_queue, verification_done_queue))
+        verifier_proc = Process(target=verifier, args=(self, to_verify_queue, verification_done_queue))
         # daemon subprocesses are killed automagically when the parent process exits
-        verifier.daemon = True
-        self.subprocs.append(verifier)
-        verifier.start()
-
-        return writer, verifier, to_verify_queue
-
-    def _start_continuous_counter_increment_and_verify(self, wait_for_rowcount=0, max_wait_s=300):
-        """
-        Starts a counter incrementer process, a verifier process, a queue to track writes,
-        and a queue to track successful verifications (which are re-increment candidates).
-
-        Returns the writer process, verifier process, and the to_verify_queue.
-        """
-        # queue of writes to be verified
-        to_verify_queue = Queue()
-        # queue of verified writes, which are update candidates
-        verification_done_queue = Queue(maxsize=500)
+        verifier_proc.daemon = True
+        self.subprocs.append(verifier_proc)
+        verifier_proc.start()
 
-        incrementer = Process(target=data_writer, args=(self, to_verify_queue, verification_done_queue, 25))
-        # daemon subprocesses are killed automagically when the parent process exits
-        incrementer.daemon = True
-        self.subprocs.append(incrementer)
-        incrementer.start()
+        return producer_proc, verifier_proc, to_verify_queue
 
-        if wait_for_rowcount > 0:
-            self._wait_until_queue_condition('counters incremented (but not verified)', to_verify_queue, operator.ge, wait_for_rowcount, max_wait_s=max_wait_s)
+    def _start_continuous_write_and_verify(self, wait_for_rowcount=0, max_wait_s=300, batch_size=64, max_pending_batches=200):
+        return self._start_producer_verifier('row batches written (but not verified)',
+                                             data_writer, data_checker,
+                                             wait_for_rowcount, max_wait_s, batch_size, max_pending_batches)
 
-        count_verifier = Process(target=data_checker, args=(self, to_verify_queue, verification_done_queue))
-        # daemon subprocesses are killed automagically when the parent process exits
-        count_verifier.daemon = True
-        self.subprocs.append(count_verifier)
-        count_verifier.start()
+    def _start_continuous_counter_increment_and_verify(self, wait_for_rowcount=0, max_wait_s=300, batch_size=64, max_pending_batches=200):
+        return self._start_producer_verifier('counter batches incremented (but not verified)',
+                                             data_writer, data_checker,
+                                             wait_for_rowcount, max_wait_s, batch_size, max_pending_batches)
 
-        return incrementer, count_verifier, to_verify_queue
+    def _get_verify_session(self):
+        """
+        Lazily opened session shared by the verification helpers, so each
+        pass doesn't pay a fresh connection handshake. Invalidated by
+        upgrade_to_version since the protocol version may change.
+        """
+        if self._verify_session is None:
+            self._verify_session = self.patient_cql_connection(self.node2, protocol_version=PROTOCOL_VERSION)
+            self._verify_session.execute("use upgrade;")
+        return self._verify_session
 
     def _increment_counters(self, opcount=25000):
         debug("performing {opcount} counter increments".format(opcount=opcount))
-        session = self.patient_cql_connection(self.node2, protocol_version=PROTOCOL_VERSION)
-        session.execute("use upgrade;")
+        session = self._get_verify_session()
 
-        update_counter_query = ("UPDATE countertable SET c = c + 1 WHERE k1='{key1}' and k2={key2}")
+        # prepared once: saves a server-side parse and a SimpleStatement
+        # allocation per increment
+        prepared = session.prepare("UPDATE countertable SET c = c + 1 WHERE k1=? and k2=?")
+        prepared.consistency_level = ConsistencyLevel.ALL
 
+        # flat (key1, key2) -> count map: one hash lookup per increment
+        # instead of a nested defaultdict hop, and only pairs that actually
+        # got incremented are checked afterwards
         self.expected_counts = {}
-        for i in range(10):
-            self.expected_counts[uuid.uuid4()] = defaultdict(int)
+        key_list = [uuid.uuid4() for i in range(10)]
 
         fail_count = 0
 
+        # pipeline the increments behind a bounded in-flight window instead
+        # of paying a CL.ALL round-trip per increment; an expected count is
+        # only bumped once its increment has been acked
+        in_flight = deque()
+
         for i in range(opcount):
-            key1 = random.choice(self.expected_counts.keys())
+            key1 = random.choice(key_list)
             key2 = random.randint(1, 10)
+
+            if len(in_flight) >= WRITE_WINDOW_SIZE:
+                future, done_key1, done_key2 = in_flight.popleft()
+                try:
+                    future.result()
+                except WriteTimeout:
+                    fail_count += 1
+                else:
+                    pair = (done_key1, done_key2)
+                    self.expected_counts[pair] = self.expected_counts.get(pair, 0) + 1
+
+            in_flight.append((session.execute_async(prepared, (str(key1), key2)), key1, key2))
+            if fail_count > 100:
+                break
+
+        for future, key1, key2 in in_flight:
             try:
-                query = SimpleStatement(update_counter_query.format(key1=key1, key2=key2), consistency_level=ConsistencyLevel.ALL)
-                session.execute(query)
+                future.result()
             except WriteTimeout:
                 fail_count += 1
             else:
-                self.expected_counts[key1][key2] += 1
-            if fail_count > 100:
-                break
+                pair = (key1, key2)
+                self.expected_counts[pair] = self.expected_counts.get(pair, 0) + 1
 
         assert fail_count < 100, "Too many counter increment failures"
 
     def _check_counters(self):
         debug("Checking counter values...")
-        session = self.patient_cql_connection(self.node2, protocol_version=PROTOCOL_VERSION)
-        session.execute("use upgrade;")
-
-        for key1 in self.expected_counts.keys():
-            for key2 in self.expected_counts[key1].keys():
-                expected_value = self.expected_counts[key1][key2]
-
-                query = SimpleStatement("SELECT c from countertable where k1='{key1}' and k2={key2};".format(key1=key1, key2=key2),
-                                        consistency_level=ConsistencyLevel.ONE)
-                results = session.execute(query)
+        session = self._get_verify_session()
+
+        prepared = session.prepare("SELECT c from countertable where k1=? and k2=?")
+        prepared.consistency_level = ConsistencyLevel.ONE
+
+        # read all the counters through the driver's concurrent executor
+        # rather than one round-trip per key pair
+        pairs = self.expected_counts.keys()
+        concurrent_results = execute_concurrent_with_args(session, prepared,
+                                                          [(str(key1), key2) for key1, key2 in pairs],
+                                                          concurrency=100)
+
+        # collect all the mismatches before failing so one bad counter
+        # doesn't hide the rest (and the passing case does no formatting)
+        mismatches = []
+        for (key1, key2), (success, results) in zip(pairs, concurrent_results):
+            expected_value = self.expected_counts[(key1, key2)]
+
+            if results is not None:
+                actual_value = results[0][0]
+            else:
+                # counter wasn't found
+                actual_value = None
 
-                if results is not None:
-                    actual_value = results[0][0]
-                else:
-                    # counter wasn't found
-                    actual_value = None
+            if actual_value != expected_value:
+                mismatches.append((key1, key2, actual_value, expected_value))
 
-                assert actual_value == expected_value, "Counter not at expected value. Got %s, expected %s" % (actual_value, expected_value)
+        assert not mismatches, \
+            "%d counters not at expected value (key1, key2, actual, expected): %r" % (len(mismatches), mismatches[:10])
 
     def _check_select_count(self, consistency_level=ConsistencyLevel.ALL):
         debug("Checking SELECT COUNT(*)")
-        session = self.patient_cql_connection(self.node2, protocol_version=PROTOCOL_VERSION)
-        session.execute("use upgrade;")
+        session = self._get_verify_session()
 
         expected_num_rows = len(self.row_values)
 
-        countquery = SimpleStatement("SELECT COUNT(*) FROM cf;", consistency_level=consistency_level)
-        result = session.execute(countquery)
+        # an unbounded COUNT(*) serializes a full cluster scan on a single
+        # coordinator; count per token range concurrently and sum locally
+        token_values = sorted(token.value for token in session.cluster.metadata.token_map.ring)
+        prepared = session.prepare("SELECT COUNT(*) FROM cf WHERE token(k) > ? AND token(k) <= ?")
+        prepared.consistency_level = consistency_level
 
-        if result is not None:
-            actual_num_rows = result[0][0]
-            self.assertEqual(actual_num_rows, expected_num_rows, "SELECT COUNT(*) returned %s when expecting %s" % (actual_num_rows, expected_num_rows))
-        else:
-            self.fail("Count query did not return")
+        bounds = [(token_values[i - 1], token_values[i]) for i in xrange(1, len(token_values))]
+        range_results = execute_concurrent_with_args(session, prepared, bounds, concurrency=32)
+
+        # the wrapping range: everything at or below the ring's lowest token,
+        # and everything above its highest
+        low_future = session.execute_async(SimpleStatement(
+            "SELECT COUNT(*) FROM cf WHERE token(k) <= %d" % token_values[0], consistency_level=consistency_level))
+        high_future = session.execute_async(SimpleStatement(
+            "SELECT COUNT(*) FROM cf WHERE token(k) > %d" % token_values[-1], consistency_level=consistency_level))
+
+        actual_num_rows = sum(result[0][0] for success, result in range_results)
+        actual_num_rows += low_future.result()[0][0] + high_future.result()[0][0]
+
+        self.assertEqual(actual_num_rows, expected_num_rows, "SELECT COUNT(*) returned %s when expecting %s" % (actual_num_rows, expected_num_rows))
 
 
 class TestRandomPartitionerUpgrade(TestUpgradeThroughVersions):
@@ -873,6 +1059,7 @@ class TestRandomPartitionerUpgrade(TestUpgradeThroughVersions):
             r'RejectedExecutionException.*ThreadPoolExecutor has shut down',
         ]
         self.subprocs = []
+        self._verify_session = None
         # Force cluster options that are common among versions:
         kwargs['cluster_options'] = {'partitioner': 'org.apache.cassandra.dht.RandomPartitioner'}
         Tester.__init__(self, *args, **kwargs)
@@ -994,36 +1181,39 @@ for i, _ in enumerate(points):
     if len(verslice) == 2:  # exclude dangling version at end
         POINT_UPGRADES.append(tuple(points[i:i + 2]))
 
-# create test classes for upgrading from latest tag on one branch, to head of the next branch (see comment above)
+# create test classes for each pair (see comment above): latest tag on one
+# branch to head of the next, head to head, and head to latest tag on the
+# next branch. One pass, so the tag and branch strings for each pair are
+# computed once.
 for (from_ver, to_branch) in POINT_UPGRADES:
-    cls_name = ('TestUpgrade_from_' + make_ver_str(from_ver) + '_latest_tag_to_' + make_branch_str(to_branch) + '_HEAD').replace('-', '_').replace('.', '_')
     from_ver_latest_tag = latest_tag_matching(from_ver)
+    to_ver_latest_tag = latest_tag_matching(to_branch)
+    from_head = make_branch_str(from_ver)
+    to_head = make_branch_str(to_branch)
+
+    # upgrading from latest tag on one branch, to head of the next branch
+    cls_name = ('TestUpgrade_from_' + make_ver_str(from_ver) + '_latest_tag_to_' + to_head + '_HEAD').replace('-', '_').replace('.', '_')
     debug('Creating test upgrade class: {} with start tag of: {} ({})'.format(cls_name, from_ver_latest_tag, sha_for_ref_name(from_ver_latest_tag)))
     vars()[cls_name] = type(
         cls_name,
         (PointToPointUpgradeBase,),
-        {'test_versions': [from_ver_latest_tag, make_branch_str(to_branch)], '__test__': True})
+        {'test_versions': [from_ver_latest_tag, to_head], '__test__': True})
 
-# create test classes for upgrading from HEAD of one branch to HEAD of next.
-for (from_branch, to_branch) in POINT_UPGRADES:
-    cls_name = ('TestUpgrade_from_' + make_branch_str(from_branch) + '_HEAD_to_' + make_branch_str(to_branch) + '_HEAD').replace('-', '_').replace('.', '_')
+    # upgrading from HEAD of one branch to HEAD of next
+    cls_name = ('TestUpgrade_from_' + from_head + '_HEAD_to_' + to_head + '_HEAD').replace('-', '_').replace('.', '_')
     debug('Creating test upgrade class: {}'.format(cls_name))
     vars()[cls_name] = type(
         cls_name,
         (PointToPointUpgradeBase,),
-        {'test_versions': [make_branch_str(from_branch), make_branch_str(to_branch)], '__test__': True})
+        {'test_versions': [from_head, to_head], '__test__': True})
 
-# create test classes for upgrading from HEAD of one branch, to latest tag of next branch
-for (from_branch, to_branch) in POINT_UPGRADES:
-    cls_name = ('TestUpgrade_from_' + make_branch_str(from_branch) + '_HEAD_to_' + make_branch_str(to_branch) + '_latest_tag').replace('-', '_').replace('.', '_')
-    to_ver_latest_tag = latest_tag_matching(to_branch)
+    # upgrading from HEAD of one branch, to latest tag of next branch.
     # in some cases we might not find a tag (like when the to_branch is trunk)
     # so these will be skipped.
-    if to_ver_latest_tag is None:
-        continue
-    debug('Creating test upgrade class: {} with end tag of: {} ({})'.format(cls_name, to_ver_latest_tag, sha_for_ref_name(to_ver_latest_tag)))
-
-    vars()[cls_name] = type(
-        cls_name,
-        (PointToPointUpgradeBase,),
-        {'test_versions': [make_branch_str(from_branch), to_ver_latest_tag], '__test__': True})
+    if to_ver_latest_tag is not None:
+        cls_name = ('TestUpgrade_from_' + from_head + '_HEAD_to_' + to_head + '_latest_tag').replace('-', '_').replace('.', '_')
+        debug('Creating test upgrade class: {} with end tag of: {} ({})'.format(cls_name, to_ver_latest_tag, sha_for_ref_name(to_ver_latest_tag)))
+        vars()[cls_name] = type(
+            cls_name,
+            (PointToPointUpgradeBase,),
+            {'test_versions': [from_head, to_ver_latest_tag], '__test__': True})